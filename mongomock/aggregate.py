@@ -6,6 +6,7 @@ import copy
 import datetime
 import decimal
 import functools
+import heapq
 import itertools
 import math
 import numbers
@@ -217,6 +218,8 @@ _GROUPING_OPERATOR_MAP = {
     '$first': lambda values: values[0] if values else None,
     '$last': lambda values: values[-1] if values else None,
 }
+# Accumulators whose computation can be skipped when their output is not used.
+_PRUNABLE_GROUP_OPERATORS = frozenset(_GROUPING_OPERATOR_MAP) | {'$addToSet', '$push'}
 
 
 class _Parser(object):
@@ -241,33 +244,10 @@ class _Parser(object):
 
         value_dict = {}
         for k, v in expression.items():
-            if k in arithmetic_operators:
-                return self._handle_arithmetic_operator(k, v)
-            if k in project_operators:
-                return self._handle_project_operator(k, v)
-            if k in projection_operators:
-                return self._handle_projection_operator(k, v)
-            if k in comparison_operators:
-                return self._handle_comparison_operator(k, v)
-            if k in date_operators:
-                return self._handle_date_operator(k, v)
-            if k in array_operators:
-                return self._handle_array_operator(k, v)
-            if k in conditional_operators:
-                return self._handle_conditional_operator(k, v)
-            if k in control_flow_operators:
-                return self._handle_control_flow_operator(k, v)
-            if k in set_operators:
-                return self._handle_set_operator(k, v)
-            if k in string_operators:
-                return self._handle_string_operator(k, v)
-            if k in type_convertion_operators:
-                return self._handle_type_convertion_operator(k, v)
-            if k in type_operators:
-                return self._handle_type_operator(k, v)
-            if k in boolean_operators:
-                return self._handle_boolean_operator(k, v)
-            if k in text_search_operators + projection_operators + object_operators:
+            handler = _PARSER_OPERATOR_HANDLERS.get(k)
+            if handler:
+                return handler(self, k, v)
+            if k in _UNSUPPORTED_EXPRESSION_OPERATORS:
                 raise NotImplementedError(
                     "'%s' is a valid operation but it is not supported by Mongomock yet." % k)
             if k.startswith('$'):
@@ -1045,15 +1025,37 @@ class _Parser(object):
             return result
         if operator == '$setEquals':
             set_values = [set(self.parse(value)) for value in values]
-            for set1, set2 in itertools.combinations(set_values, 2):
-                if set1 != set2:
-                    return False
-            return True
+            # Set equality is transitive: comparing every set to the first one is enough.
+            return all(set_value == set_values[0] for set_value in set_values[1:])
         raise NotImplementedError(
             "Although '%s' is a valid set operator for the aggregation "
             'pipeline, it is currently not implemented in Mongomock.' % operator)
 
 
+# Handler of each expression operator. When an operator belongs to several groups, the first
+# group listed here wins.
+_PARSER_OPERATOR_HANDLERS = {
+    operator: handler
+    for operators, handler in reversed((
+        (arithmetic_operators, _Parser._handle_arithmetic_operator),
+        (project_operators, _Parser._handle_project_operator),
+        (projection_operators, _Parser._handle_projection_operator),
+        (comparison_operators, _Parser._handle_comparison_operator),
+        (date_operators, _Parser._handle_date_operator),
+        (array_operators, _Parser._handle_array_operator),
+        (conditional_operators, _Parser._handle_conditional_operator),
+        (control_flow_operators, _Parser._handle_control_flow_operator),
+        (set_operators, _Parser._handle_set_operator),
+        (string_operators, _Parser._handle_string_operator),
+        (type_convertion_operators, _Parser._handle_type_convertion_operator),
+        (type_operators, _Parser._handle_type_operator),
+        (boolean_operators, _Parser._handle_boolean_operator),
+    ))
+    for operator in operators
+}
+_UNSUPPORTED_EXPRESSION_OPERATORS = frozenset(text_search_operators + object_operators)
+
+
 def _parse_expression(expression, doc_dict, ignore_missing_keys=False):
     """Parse an expression.
 
@@ -1070,16 +1072,55 @@ def _parse_expression(expression, doc_dict, ignore_missing_keys=False):
 filtering.register_parse_expression(_parse_expression)
 
 
+def _is_constant_expression(expression):
+    """Whether an expression refers to no field and no variable of the documents."""
+    if isinstance(expression, str):
+        return not expression.startswith('$')
+    if isinstance(expression, dict):
+        return all(_is_constant_expression(value) for value in expression.values())
+    if isinstance(expression, (list, tuple)):
+        return all(_is_constant_expression(value) for value in expression)
+    return True
+
+
+def _get_expression_evaluator(expression):
+    """Get a function evaluating an expression on a document, ignoring missing keys.
+
+    Constant expressions, e.g. {'$pow': [4, 2]}, are only evaluated for the first document and
+    the result is reused (copied if mutable) for the following ones.
+    """
+    if not _is_constant_expression(expression):
+        return lambda doc: _parse_expression(expression, doc, ignore_missing_keys=True)
+
+    constant_values = []
+
+    def _evaluate_constant(doc):
+        if not constant_values:
+            constant_values.append(_parse_expression(expression, doc, ignore_missing_keys=True))
+        value = constant_values[0]
+        if isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
+        return value
+
+    return _evaluate_constant
+
+
 def _accumulate_group(output_fields, group_list):
     doc_dict = {}
     for field, value in output_fields.items():
         if field == '_id':
             continue
         for operator, key in value.items():
+            if isinstance(key, str) and key.startswith('$') and not key.startswith('$$'):
+                # Plain field path: read the values directly instead of parsing per document.
+                get_value = functools.partial(
+                    helpers.get_value_by_dot, key=key[1:], can_generate_array=True)
+            else:
+                get_value = functools.partial(_parse_expression, key)
             values = []
             for doc in group_list:
                 try:
-                    values.append(_parse_expression(key, doc))
+                    values.append(get_value(doc))
                 except KeyError:
                     continue
             if operator in _GROUPING_OPERATOR_MAP:
@@ -1267,18 +1308,20 @@ def _handle_group_stage(in_collection, unused_database, options):
             except KeyError:
                 return None
 
-        def _sort_key_getter(doc):
-            return filtering.BsonComparable(_key_getter(doc))
+        # Evaluate the group key once per document, and keep it next to the document.
+        keyed_collection = [(_key_getter(doc), doc) for doc in in_collection]
 
         # Sort the collection only for the itertools.groupby.
         # $group does not order its output document.
-        sorted_collection = sorted(in_collection, key=_sort_key_getter)
-        grouped = itertools.groupby(sorted_collection, _key_getter)
+        keyed_collection.sort(key=lambda keyed_doc: filtering.BsonComparable(keyed_doc[0]))
+        grouped = (
+            (doc_id, [doc for unused_doc_id, doc in group])
+            for doc_id, group in itertools.groupby(
+                keyed_collection, key=lambda keyed_doc: keyed_doc[0]))
     else:
-        grouped = [(None, in_collection)]
+        grouped = [(None, list(in_collection))]
 
-    for doc_id, group in grouped:
-        group_list = ([x for x in group])
+    for doc_id, group_list in grouped:
         doc_dict = _accumulate_group(options, group_list)
         doc_dict['_id'] = doc_id
         grouped_collection.append(doc_dict)
@@ -1364,7 +1407,36 @@ def _handle_sample_stage(in_collection, unused_database, options):
     return shuffled[:size]
 
 
-def _handle_sort_stage(in_collection, unused_database, options):
+class _TopSortKey(object):
+    """Sort key of a document for a $sort stage directly followed by a $limit.
+
+    It orders documents like the full stable sort of _handle_sort_stage does, including
+    keeping the input order of ties, so that heapq can select the first documents only.
+    """
+
+    def __init__(self, options, index, doc):
+        self._keys = [
+            (filtering.resolve_sort_key(key, doc), direction < 0)
+            for key, direction in options.items()]
+        self._index = index
+
+    def __lt__(self, other):
+        for (key, descending), (other_key, unused_descending) in zip(self._keys, other._keys):
+            if key < other_key:
+                return not descending
+            if other_key < key:
+                return descending
+        return self._index < other._index
+
+
+def _handle_sort_stage(in_collection, unused_database, options, limit=None):
+    if limit is not None:
+        # Only the first documents are kept: select them instead of sorting everything.
+        top_docs = heapq.nsmallest(
+            limit, enumerate(in_collection),
+            key=lambda indexed_doc: _TopSortKey(options, *indexed_doc))
+        return [doc for unused_index, doc in top_docs]
+
     sort_array = reversed([{x: y} for x, y in options.items()])
     sorted_collection = in_collection
     for sort_pair in sort_array:
@@ -1523,9 +1595,10 @@ def _handle_project_stage(in_collection, unused_database, options):
         if not new_fields_collection:
             new_fields_collection = [{} for unused_doc in in_collection]
 
+        evaluate = _get_expression_evaluator(value)
         for in_doc, out_doc in zip(in_collection, new_fields_collection):
             try:
-                out_doc[field] = _parse_expression(value, in_doc, ignore_missing_keys=True)
+                out_doc[field] = evaluate(in_doc)
             except KeyError:
                 # Ignore missing key.
                 pass
@@ -1555,9 +1628,10 @@ def _handle_add_fields_stage(in_collection, unused_database, options):
             'Invalid $addFields :: caused by :: specification must have at least one field')
     out_collection = [dict(doc) for doc in in_collection]
     for field, value in options.items():
+        evaluate = _get_expression_evaluator(value)
         for in_doc, out_doc in zip(in_collection, out_collection):
             try:
-                out_value = _parse_expression(value, in_doc, ignore_missing_keys=True)
+                out_value = evaluate(in_doc)
             except KeyError:
                 continue
             parts = field.split('.')
@@ -1640,11 +1714,64 @@ _PIPELINE_HANDLERS = {
 }
 
 
+def _get_following_limit(pipeline, index):
+    """Get the limit of the stage following pipeline[index] if it is a plain $limit stage."""
+    if index + 1 >= len(pipeline):
+        return None
+    next_stage = pipeline[index + 1]
+    if len(next_stage) != 1 or '$limit' not in next_stage:
+        return None
+    limit = next_stage['$limit']
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit <= 0:
+        return None
+    return limit
+
+
+def _get_following_inclusion_fields(pipeline, index):
+    """Get the top-level fields kept by the stage following pipeline[index].
+
+    Returns None unless that stage is a $project made only of field inclusions.
+    """
+    if index + 1 >= len(pipeline):
+        return None
+    next_stage = pipeline[index + 1]
+    if len(next_stage) != 1 or '$project' not in next_stage:
+        return None
+    projection = next_stage['$project']
+    if not isinstance(projection, dict) or not all(
+            isinstance(value, (bool, int)) for value in projection.values()):
+        return None
+    if not any(value for field, value in projection.items() if field != '_id'):
+        return None
+    return {field.split('.', 1)[0] for field, value in projection.items() if value}
+
+
+def _is_prunable_accumulator(value):
+    """Whether a $group output field is a supported accumulator, that can be skipped safely.
+
+    Only accumulators over a field path or a constant are skipped: any other argument is an
+    expression that still has to be evaluated to report its errors.
+    """
+    if not isinstance(value, dict) or len(value) != 1:
+        return False
+    operator, key = next(iter(value.items()))
+    return operator in _PRUNABLE_GROUP_OPERATORS and not isinstance(key, (dict, list))
+
+
+def _prune_group_options(options, live_fields):
+    """Drop the accumulators of a $group stage whose output is not used afterwards."""
+    return {
+        field: value for field, value in options.items()
+        if field == '_id' or field in live_fields or not _is_prunable_accumulator(value)
+    }
+
+
 def process_pipeline(collection, database, pipeline, session):
     if session:
         raise NotImplementedError('Mongomock does not handle sessions yet')
 
-    for stage in pipeline:
+    pipeline = list(pipeline)
+    for index, stage in enumerate(pipeline):
         for operator, options in stage.items():
             try:
                 handler = _PIPELINE_HANDLERS[operator]
@@ -1657,6 +1784,15 @@ def process_pipeline(collection, database, pipeline, session):
                 raise NotImplementedError(
                     "Although '%s' is a valid operator for the aggregation pipeline, it is "
                     'currently not implemented in Mongomock.' % operator)
+            if operator == '$group' and isinstance(options, dict):
+                live_fields = _get_following_inclusion_fields(pipeline, index)
+                if live_fields is not None:
+                    options = _prune_group_options(options, live_fields)
+            if operator == '$sort':
+                limit = _get_following_limit(pipeline, index)
+                if limit is not None:
+                    collection = _handle_sort_stage(collection, database, options, limit=limit)
+                    continue
             collection = handler(collection, database, options)
 
     return command_cursor.CommandCursor(collection)
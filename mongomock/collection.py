@@ -7,6 +7,7 @@ import functools
 import itertools
 import json
 import math
+from operator import itemgetter
 from packaging import version
 import time
 import warnings
@@ -63,6 +64,10 @@ try:
 except ImportError:
     from mongomock.read_concern import ReadConcern
 
+# Scalar types for which hashing agrees with the equality checks of the array update operators,
+# so that those can use set lookups.
+_LITERAL_TYPES = (str, int, float, type(None))
+
 _KwargOption = collections.namedtuple('KwargOption', ['typename', 'default', 'attrs'])
 
 _WITH_OPTIONS_KWARGS = {
@@ -75,6 +80,70 @@ _WITH_OPTIONS_KWARGS = {
 }
 
 
+def _get_elem_match_predicate(subspec):
+    """Get a function telling whether an array item matches a positional $elemMatch spec.
+
+    Specs made only of equalities to literal values on top-level fields, like
+    {'name': 'derby'}, are checked with plain comparisons instead of running the whole
+    filter machinery on every item.
+    """
+    if not isinstance(subspec, dict) or not subspec or not all(
+            isinstance(key, str) and not key.startswith('$') and '.' not in key
+            and isinstance(value, (str, int, float))
+            for key, value in subspec.items()):
+        return functools.partial(filter_applies, subspec)
+
+    def _matches(item):
+        if not isinstance(item, dict):
+            return filter_applies(subspec, item)
+        for key, value in subspec.items():
+            item_value = item.get(key, NOTHING)
+            if isinstance(item_value, (list, tuple)):
+                # Arrays match if any of their elements does: use the generic filter.
+                return filter_applies(subspec, item)
+            if item_value != value:
+                return False
+        return True
+
+    return _matches
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_js(source):
+    """Compile a JavaScript source with execjs, reusing the context for the same source."""
+    return execjs.compile(source)
+
+
+def _get_pulled_literals(value, arr):
+    """Get the set of values a $pull removes from arr, if it can be done by simple lookups.
+
+    This is the case for a {'$in': [...]} condition listing only scalar values, applied to an
+    array of scalar values. Returns None when the query matcher is needed.
+    """
+    if not isinstance(value, dict) or list(value) != ['$in']:
+        return None
+    in_values = value['$in']
+    if not isinstance(in_values, (list, tuple)):
+        return None
+    if not all(isinstance(obj, _LITERAL_TYPES) for obj in itertools.chain(in_values, arr)):
+        return None
+    return frozenset(in_values)
+
+
+def _add_to_set(array, values):
+    """Append to array, in order, each of the values it does not contain yet."""
+    if all(isinstance(obj, _LITERAL_TYPES) for obj in itertools.chain(array, values)):
+        known_values = set(array)
+        for obj in values:
+            if obj not in known_values:
+                known_values.add(obj)
+                array.append(obj)
+        return
+    for obj in values:
+        if obj not in array:
+            array.append(obj)
+
+
 def validate_is_mapping(option, value):
     if not isinstance(value, Mapping):
         raise TypeError('%s must be an instance of dict, bson.son.SON, or '
@@ -714,19 +783,15 @@ class Collection(object):
 
                 elif k == '$addToSet':
                     for field, value in v.items():
-                        nested_field_list = field.rsplit('.')
+                        nested_field_list = helpers.split_dotted_key(field)
                         if len(nested_field_list) == 1:
                             if field not in existing_document:
                                 existing_document[field] = []
                             # document should be a list append to it
-                            if isinstance(value, dict):
-                                if '$each' in value:
-                                    # append the list to the field
-                                    existing_document[field] += [
-                                        obj for obj in list(value['$each'])
-                                        if obj not in existing_document[field]]
-                                    continue
-                            if value not in existing_document[field]:
+                            if isinstance(value, dict) and '$each' in value:
+                                # append the list to the field
+                                _add_to_set(existing_document[field], list(value['$each']))
+                            elif value not in existing_document[field]:
                                 existing_document[field].append(value)
                             continue
                         # push to array in a nested attribute
@@ -753,16 +818,14 @@ class Collection(object):
                                     nested_field_list[-1]]
 
                             if isinstance(value, dict) and '$each' in value:
-                                push_results += [
-                                    obj for obj in list(value['$each'])
-                                    if obj not in push_results]
+                                _add_to_set(push_results, list(value['$each']))
                             elif value not in push_results:
                                 push_results.append(value)
 
                             subdocument[nested_field_list[-1]] = push_results
                 elif k == '$pull':
                     for field, value in v.items():
-                        nested_field_list = field.rsplit('.')
+                        nested_field_list = helpers.split_dotted_key(field)
                         # nested fields includes a positional element
                         # need to find that element
                         if '$' in nested_field_list:
@@ -794,9 +857,11 @@ class Collection(object):
                             if not isinstance(arr, list):
                                 continue
 
-                            arr_copy = copy.deepcopy(arr)
-                            if isinstance(value, dict):
-                                for obj in arr_copy:
+                            pulled_values = _get_pulled_literals(value, arr)
+                            if pulled_values is not None:
+                                arr[:] = [obj for obj in arr if obj not in pulled_values]
+                            elif isinstance(value, dict):
+                                for obj in copy.deepcopy(arr):
                                     try:
                                         is_matching = filter_applies(value, obj)
                                     except OperationFailure:
@@ -808,12 +873,10 @@ class Collection(object):
                                     if filter_applies({'field': value}, {'field': obj}):
                                         arr.remove(obj)
                             else:
-                                for obj in arr_copy:
-                                    if value == obj:
-                                        arr.remove(obj)
+                                arr[:] = [obj for obj in arr if value != obj]
                 elif k == '$pullAll':
                     for field, value in v.items():
-                        nested_field_list = field.rsplit('.')
+                        nested_field_list = helpers.split_dotted_key(field)
                         if len(nested_field_list) == 1:
                             if field in existing_document:
                                 arr = existing_document[field]
@@ -831,7 +894,7 @@ class Collection(object):
                 elif k == '$push':
                     for field, value in v.items():
                         # Find the place where to push.
-                        nested_field_list = field.rsplit('.')
+                        nested_field_list = helpers.split_dotted_key(field)
                         subdocument, field = self._get_subdocument(
                             existing_document, spec, nested_field_list)
 
@@ -840,39 +903,59 @@ class Collection(object):
                             subdocument[field] = []
                         push_results = subdocument[field]
                         if isinstance(value, dict) and '$each' in value:
+                            unused_modifiers = \
+                                set(value.keys()) - {'$each', '$slice', '$position', '$sort'}
+                            if unused_modifiers:
+                                raise WriteError(
+                                    'Unrecognized clause in $push: ' + unused_modifiers.pop())
+
+                            each_values = value['$each']
+                            if not isinstance(each_values, (list, tuple)):
+                                raise WriteError(
+                                    'The argument to $each in $push must be an array but it '
+                                    'was of type: %s' % type(each_values).__name__)
+                            if '$sort' in value:
+                                sort_spec = value['$sort']
+                                sort_directions = sort_spec.values() \
+                                    if isinstance(sort_spec, dict) else [sort_spec]
+                                if any(direction not in (1, -1) for direction in sort_directions):
+                                    raise WriteError(
+                                        'The $sort element value must be either 1 or -1')
+
+                            if value.get('$slice') == 0:
+                                # Nothing is kept, whatever the other modifiers.
+                                subdocument[field] = []
+                                continue
+
                             if '$position' in value:
-                                push_results = \
-                                    push_results[0:value['$position']] + \
-                                    list(value['$each']) + \
-                                    push_results[value['$position']:]
+                                position = value['$position']
+                                push_results[position:position] = each_values
                             else:
-                                push_results += list(value['$each'])
+                                push_results.extend(each_values)
 
                             if '$sort' in value:
-                                sort_spec = value['$sort']
                                 if isinstance(sort_spec, dict):
-                                    sort_key = set(sort_spec.keys()).pop()
-                                    push_results = sorted(
-                                        push_results,
-                                        key=lambda d: helpers.get_value_by_dot(d, sort_key),
-                                        reverse=set(sort_spec.values()).pop() < 0)
+                                    # Sort by the least significant key first, relying on
+                                    # the stability of sorted.
+                                    for sort_key, sort_direction in reversed(
+                                            list(sort_spec.items())):
+                                        if '.' in sort_key:
+                                            key_getter = functools.partial(
+                                                helpers.get_value_by_dot, key=sort_key)
+                                        else:
+                                            key_getter = itemgetter(sort_key)
+                                        push_results = sorted(
+                                            push_results, key=key_getter,
+                                            reverse=sort_direction < 0)
                                 else:
                                     push_results = sorted(push_results, reverse=sort_spec < 0)
 
                             if '$slice' in value:
                                 slice_value = value['$slice']
                                 if slice_value < 0:
-                                    push_results = push_results[slice_value:]
-                                elif slice_value == 0:
-                                    push_results = []
+                                    del push_results[:slice_value]
                                 else:
-                                    push_results = push_results[:slice_value]
-
-                            unused_modifiers = \
-                                set(value.keys()) - {'$each', '$slice', '$position', '$sort'}
-                            if unused_modifiers:
-                                raise WriteError(
-                                    'Unrecognized clause in $push: ' + unused_modifiers.pop())
+                                    del push_results[slice_value:]
                         else:
                             push_results.append(value)
                         subdocument[field] = push_results
@@ -975,8 +1058,9 @@ class Collection(object):
                 subspec = subspec['$elemMatch']
                 is_following_spec = False
                 # Iterate through.
+                matches = _get_elem_match_predicate(subspec)
                 for spec_index, item in enumerate(doc):
-                    if filter_applies(subspec, item):
+                    if matches(item):
                         subfield = spec_index
                         break
                 else:
@@ -1219,15 +1303,16 @@ class Collection(object):
         for k, v in fields.items():
             if '$' in k:
 
-                field_name_parts = k.split('.')
+                field_name_parts = helpers.split_dotted_key(k)
                 if not subdocument:
                     current_doc = doc
                     subspec = spec
                     for part in field_name_parts[:-1]:
                         if part == '$':
-                            subspec_dollar = subspec.get('$elemMatch', subspec)
+                            matches = _get_elem_match_predicate(
+                                subspec.get('$elemMatch', subspec))
                             for item in current_doc:
-                                if filter_applies(subspec_dollar, item):
+                                if matches(item):
                                     current_doc = item
                                     break
                             continue
@@ -1245,9 +1330,9 @@ class Collection(object):
 
                     subdocument = current_doc
                     if field_name_parts[-1] == '$' and isinstance(subdocument, list):
+                        matches = _get_elem_match_predicate(subspec.get('$elemMatch', subspec))
                         for i, doc in enumerate(subdocument):
-                            subspec_dollar = subspec.get('$elemMatch', subspec)
-                            if filter_applies(subspec_dollar, doc):
+                            if matches(doc):
                                 subdocument[i] = v
                                 break
                         continue
@@ -1270,7 +1355,7 @@ class Collection(object):
         return subdocument
 
     def _update_document_single_field(self, doc, field_name, field_value, updater):
-        field_name_parts = field_name.split('.')
+        field_name_parts = helpers.split_dotted_key(field_name)
         for part in field_name_parts[:-1]:
             if isinstance(doc, list):
                 try:
@@ -1649,7 +1734,7 @@ class Collection(object):
                 'timeMillis': 0,
                 'ok': 1.0,
                 'result': None}
-            map_ctx = execjs.compile('''
+            map_ctx = _compile_js('''
                 function doMap(fnc, docList) {
                     var mappedDict = {};
                     function emit(key, val) {
@@ -1673,7 +1758,7 @@ class Collection(object):
                     return mappedDict;
                 }
             ''')
-            reduce_ctx = execjs.compile('''
+            reduce_ctx = _compile_js('''
                 function doReduce(fnc, docList) {
                     var reducedList = new Array();
                     reducer = eval('('+fnc+')');
@@ -1744,7 +1829,7 @@ class Collection(object):
                     'PyExecJS is required in order to use group. '
                     "Use 'pip install pyexecjs pymongo' to support group mock."
                 )
-            reduce_ctx = execjs.compile('''
+            reduce_ctx = _compile_js('''
                 function doReduce(fnc, docList) {
                     reducer = eval('('+fnc+')');
                     for(var i=0, l=docList.length; i<l; i++) {
@@ -2097,7 +2182,8 @@ def _pop_updater(doc, field_name, value):
 
     if isinstance(doc, dict):
         if isinstance(doc[field_name], (tuple, list)):
-            doc[field_name] = list(doc[field_name])
+            if isinstance(doc[field_name], tuple):
+                doc[field_name] = list(doc[field_name])
             _pop_from_list(doc[field_name], value)
             return
         raise WriteError('Path contains element of non-array type')
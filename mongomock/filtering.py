@@ -74,6 +74,7 @@ class _Filterer(object):
             key: _not_nothing_and(_list_expand(_compare_objects(op)))
             for key, op in SORTING_OPERATOR_MAP.items()
         })
+        self._known_operators = frozenset(self._operator_map) | {'$not'}
 
     def apply(self, search_filter, document):
         if not isinstance(search_filter, dict):
@@ -83,10 +84,11 @@ class _Filterer(object):
             # Top level operators.
             if key == '$comment':
                 continue
-            if key in LOGICAL_OPERATOR_MAP:
+            logical_operator = LOGICAL_OPERATOR_MAP.get(key)
+            if logical_operator:
                 if not search:
                     raise OperationFailure('BadValue $and/$or/$nor must be a nonempty array')
-                if not LOGICAL_OPERATOR_MAP[key](document, search, self.apply):
+                if not logical_operator(document, search, self.apply):
                     return False
                 continue
             if key == '$expr':
@@ -125,7 +127,7 @@ class _Filterer(object):
                 if is_ops_filter:
                     if '$options' in search and '$regex' in search:
                         search = _combine_regex_options(search)
-                    unknown_operators = set(search) - set(self._operator_map) - {'$not'}
+                    unknown_operators = set(search) - self._known_operators
                     if unknown_operators:
                         not_implemented_operators = unknown_operators & _NOT_IMPLEMENTED_OPERATORS
                         if not_implemented_operators:
@@ -1,6 +1,7 @@
 from collections import abc
 from collections import OrderedDict
 from datetime import datetime, timedelta, tzinfo
+import functools
 from mongomock import InvalidURI
 from packaging import version
 import re
@@ -118,12 +119,21 @@ class hashdict(dict):
     based on answers from
     http://stackoverflow.com/questions/1151658/python-hashable-dicts
     """
+    # Only room for the cached key, hashdicts are built in large numbers.
+    __slots__ = ('__frozen_key',)
+
     def __key(self):
-        return frozenset((k,
-                          hashdict(v) if isinstance(v, dict) else
-                          tuple(v) if isinstance(v, list) else
-                          v)
-                         for k, v in self.items())
+        # The content cannot change once built, so the frozen key (which
+        # recursively freezes nested dicts) is computed only once.
+        try:
+            return self.__frozen_key
+        except AttributeError:
+            self.__frozen_key = frozenset((k,
+                                           hashdict(v) if isinstance(v, dict) else
+                                           tuple(v) if isinstance(v, list) else
+                                           v)
+                                          for k, v in self.items())
+            return self.__frozen_key
 
     def __repr__(self):
         return '{0}({1})'.format(
@@ -162,9 +172,9 @@ class hashdict(dict):
                         .format(self.__class__.__name__))
 
     def __add__(self, right):
-        result = hashdict(self)
-        dict.update(result, right)
-        return result
+        result = dict(self)
+        result.update(right)
+        return hashdict(result)
 
 
 def fields_list_to_dict(fields):
@@ -353,10 +363,16 @@ def make_datetime_timezone_aware_in_document(value):
     return value
 
 
+@functools.lru_cache(maxsize=1024)
+def split_dotted_key(key):
+    """Split a dotted key into its parts, cached as the same keys come back often."""
+    return tuple(key.split('.'))
+
+
 def get_value_by_dot(doc, key, can_generate_array=False):
     """Get dictionary value using dotted key"""
     result = doc
-    key_items = key.split('.')
+    key_items = split_dotted_key(key)
     for key_index, key_item in enumerate(key_items):
         if isinstance(result, dict):
             result = result[key_item]
@@ -7,6 +7,9 @@ from mongomock.helpers import RE_TYPE
 
 _COMPARE_EXCEPTIONS = 'exceptions'
 
+# Values that _deepcopy can share instead of going through copy.deepcopy.
+_NO_COPY_TYPES = (RE_TYPE, str, bytes, int, float, type(None))
+
 
 class MultiCollection(object):
 
@@ -96,6 +99,13 @@ class ForeachMethod(object):
 
 
 def _assert_no_diff(results, ignore_order, sort_by):
+    if len(results) < 2:
+        # Nothing to compare against, e.g. when only running mongomock. Cursors are lazy
+        # though, so still consume them to make sure the query runs without errors.
+        for value in results.values():
+            if _is_cursor(value) or _is_command_cursor(value):
+                _expand_cursor(value, sort=False)
+        return
     if _result_is_cursor(results) or _result_is_command_cursor(results):
         # If we were given a sort function, use that.
         if sort_by is not None:
@@ -116,13 +126,20 @@ def _assert_no_diff(results, ignore_order, sort_by):
         prev_value = value
 
 
+def _is_cursor(result):
+    return type(result).__name__ == 'Cursor'
+
+
+def _is_command_cursor(result):
+    return type(result).__name__ == 'CommandCursor'
+
+
 def _result_is_cursor(results):
-    return any(type(result).__name__ == 'Cursor' for result in results.values())
+    return any(_is_cursor(result) for result in results.values())
 
 
 def _result_is_command_cursor(results):
-    return any(type(result).__name__ == 'CommandCursor'
-               for result in results.values())
+    return any(_is_command_cursor(result) for result in results.values())
 
 
 def by_id(document):
@@ -150,8 +167,8 @@ def _format_diff_message(a_name, b_name, diff_list):
 
 
 def _deepcopy(x):
-    """Deepcopy, but ignore regex objects..."""
-    if isinstance(x, RE_TYPE):
+    """Deepcopy, but ignore regex objects and immutable scalars..."""
+    if isinstance(x, _NO_COPY_TYPES):
         return x
     if isinstance(x, list) or isinstance(x, tuple):
         return type(x)(_deepcopy(y) for y in x)
@@ -1,5 +1,4 @@
 from packaging import version
-import sys
 import unittest
 from unittest import skipIf, skipUnless
 
@@ -93,7 +92,6 @@ class MongoClientApiTest(unittest.TestCase):
             mongomock.MongoClient('/var/socket/mongo.sock'),
             mongomock.MongoClient('localhost'))
 
-    @skipIf(sys.version_info < (3,), 'Older versions of Python do not handle hashing the same way')
     @skipUnless(
         helpers.PYMONGO_VERSION < version.parse('3.12'),
         "older versions of pymongo didn't have proper hashing")
@@ -101,7 +99,6 @@ class MongoClientApiTest(unittest.TestCase):
         with self.assertRaises(TypeError):
             {mongomock.MongoClient('localhost')}  # pylint: disable=expression-not-assigned
 
-    @skipIf(sys.version_info < (3,), 'Older versions of Python do not handle hashing the same way')
     @skipIf(
         helpers.PYMONGO_VERSION < version.parse('3.12'),
         "older versions of pymongo didn't have proper hashing")
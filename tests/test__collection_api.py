@@ -1005,6 +1005,17 @@ class CollectionAPITest(TestCase):
         }}})
         self.assertEqual([], self.db.collection.find_one()['scores'])
 
+    def test__update_push_slice_to_zero_invalid_modifiers(self):
+        self.db.collection.insert_one({'scores': [40, 50, 60]})
+        for push_value in (
+                {'$each': 5, '$slice': 0},
+                {'$each': [80], '$sort': 'up', '$slice': 0},
+                {'$each': [{'a': 1}], '$sort': {'a': 2}, '$slice': 0}):
+            with self.subTest(push_value=push_value):
+                with self.assertRaises(mongomock.WriteError):
+                    self.db.collection.update_one({}, {'$push': {'scores': push_value}})
+                self.assertEqual([40, 50, 60], self.db.collection.find_one()['scores'])
+
     def test__update_push_slice_only(self):
         self.db.collection.insert_one({'scores': [89, 70, 100, 20]})
         self.db.collection.update_one({}, {'$push': {'scores': {
@@ -1043,6 +1054,19 @@ class CollectionAPITest(TestCase):
             {'b': [{'value': 1}, {'value': 2}, {'value': 3}, {'value': 4}]},
             self.db.collection.find_one()['a'])
 
+    def test__update_push_sort_multiple_keys(self):
+        self.db.collection.insert_one({'a': [
+            {'x': 1, 'y': {'z': 1}}, {'x': 2, 'y': {'z': 2}}, {'x': 1, 'y': {'z': 3}},
+        ]})
+        self.db.collection.update_one({}, {'$push': {'a': {
+            '$each': [{'x': 2, 'y': {'z': 0}}],
+            '$sort': collections.OrderedDict([('x', -1), ('y.z', 1)]),
+        }}})
+        self.assertEqual([
+            {'x': 2, 'y': {'z': 0}}, {'x': 2, 'y': {'z': 2}},
+            {'x': 1, 'y': {'z': 1}}, {'x': 1, 'y': {'z': 3}},
+        ], self.db.collection.find_one()['a'])
+
     def test__update_push_sort_document(self):
         self.db.collection.insert_one({'a': {'b': [3, 1, 2]}})
         self.db.collection.update_one({}, {'$push': {'a.b': {
@@ -1082,6 +1106,8 @@ class CollectionAPITest(TestCase):
                     '$each': [15, 13],
                     '$a_clause_that_does_not_exit': 1,
                 }}})
+        self.assertEqual(
+            [{'scores': [0, 1]}, {'scores': [2, 3]}], self.db.collection.find_one()['games'])
 
     def test__update_push_positional_nested_field(self):
         self.db.collection.insert_one({'games': [{}]})
@@ -1112,6 +1138,21 @@ class CollectionAPITest(TestCase):
         self.db.collection.update_one({}, {'$pull': {'arr': {'$in': ['a1']}}})
         self.assertEqual({'b': 0, 'arr': ['a2']}, self.db.collection.find_one({}, {'_id': 0}))
 
+    def test__update_pull_in_array_of_arrays(self):
+        self.db.collection.insert_one({'arr': [1, [1, 2], [3], 2, None]})
+        self.db.collection.update_one({}, {'$pull': {'arr': {'$in': [1, None]}}})
+        self.assertEqual({'arr': [[3], 2]}, self.db.collection.find_one({}, {'_id': 0}))
+
+    def test__update_add_to_set_each(self):
+        self.db.collection.insert_one({'arr': ['a', 1], 'sub': {'arr': [{'b': 1}]}})
+        self.db.collection.update_one({}, {'$addToSet': {
+            'arr': {'$each': ['b', 'a', 'b', 2]},
+            'sub.arr': {'$each': [{'b': 1}, {'b': 2}, {'b': 2}]},
+        }})
+        self.assertEqual(
+            {'arr': ['a', 1, 'b', 2], 'sub': {'arr': [{'b': 1}, {'b': 2}]}},
+            self.db.collection.find_one({}, {'_id': 0}))
+
     def test__update_pull_in_nested(self):
         self.db.collection.insert_one({'food': {
             'fruits': ['apples', 'pears', 'oranges', 'grapes', 'bananas'],
@@ -1887,6 +1928,23 @@ class CollectionAPITest(TestCase):
 
         self.assertEqual(list(self.db.collection.find()), [expected_document])
 
+    def test__set_positional_operator_elem_match_literals(self):
+        self.db.collection.insert_one({'list_field': [
+            'a',
+            {'str_field': 'b', 'int_field': 2},
+            {'str_field': ['a', 'b'], 'int_field': 1},
+            {'str_field': 'b', 'int_field': 1},
+        ]})
+        self.db.collection.update_one(
+            {'list_field': {'$elemMatch': {'str_field': 'b', 'int_field': 1}}},
+            {'$set': {'list_field.$.marker': True}})
+        self.assertEqual([
+            'a',
+            {'str_field': 'b', 'int_field': 2},
+            {'str_field': ['a', 'b'], 'int_field': 1, 'marker': True},
+            {'str_field': 'b', 'int_field': 1},
+        ], self.db.collection.find_one({}, {'_id': 0})['list_field'])
+
     @skipIf(not helpers.HAVE_PYMONGO, 'pymongo not installed')
     @skipIf(
         helpers.PYMONGO_VERSION and helpers.PYMONGO_VERSION >= version.parse('4.0'),
@@ -3733,6 +3791,46 @@ class CollectionAPITest(TestCase):
         ]))
         self.assertEqual([{'one_count': 2}], actual)
 
+    def test__aggregate_sort_then_limit(self):
+        self.db.a.insert_many([
+            {'_id': 1, 'a': 1, 'b': 2},
+            {'_id': 2, 'a': 2, 'b': 1},
+            {'_id': 3, 'a': 1, 'b': 1},
+            {'_id': 4, 'b': 3},
+            {'_id': 5, 'a': 2, 'b': 1},
+            {'_id': 6, 'a': 1, 'b': 2},
+        ])
+        for sort, limit, expected_ids in (
+                ({'a': 1}, 3, [4, 1, 3]),
+                ({'a': -1}, 3, [2, 5, 1]),
+                (collections.OrderedDict([('a', 1), ('b', -1)]), 4, [4, 1, 6, 3]),
+                (collections.OrderedDict([('b', 1), ('a', -1)]), 2, [2, 5]),
+                ({'a': 1}, 10, [4, 1, 3, 6, 2, 5])):
+            with self.subTest(sort=sort, limit=limit):
+                actual = self.db.a.aggregate([{'$sort': sort}, {'$limit': limit}])
+                self.assertEqual(expected_ids, [doc['_id'] for doc in actual])
+
+    def test__aggregate_sort_then_limit_matches_full_sort(self):
+        self.db.a.insert_many([
+            {'_id': 1, 'a': 1, 'b': 2},
+            {'_id': 2, 'a': 2, 'b': 1},
+            {'_id': 3, 'a': 1, 'b': 1},
+            {'_id': 4, 'b': 3},
+            {'_id': 5, 'a': 2, 'b': 1},
+            {'_id': 6, 'a': 1, 'b': 2},
+        ])
+        for sort in (
+                {'a': 0},
+                {'a': 2},
+                {'a': -2},
+                collections.OrderedDict([('a', 0), ('b', -1)]),
+                collections.OrderedDict([('b', -3), ('a', 5)])):
+            for limit in (1, 3, 10):
+                with self.subTest(sort=sort, limit=limit):
+                    fully_sorted = list(self.db.a.aggregate([{'$sort': sort}]))
+                    actual = self.db.a.aggregate([{'$sort': sort}, {'$limit': limit}])
+                    self.assertEqual(fully_sorted[:limit], list(actual))
+
     def test__aggregate_count_errors(self):
         self.db.a.insert_many([
             {'_id': i}
@@ -4076,6 +4174,23 @@ class CollectionAPITest(TestCase):
         ])
         self.assertEqual([{'a': 3}], list(actual))
 
+    def test__aggregate_project_constant_expressions(self):
+        self.db.collection.insert_many([{'_id': 1}, {'_id': 2}])
+        actual = list(self.db.collection.aggregate([
+            {'$project': {
+                'pow': {'$pow': [4, 2]},
+                'arr': {'$concatArrays': [[1], [2]]},
+                'id_plus_one': {'$add': ['$_id', 1]},
+            }},
+            {'$addFields': {'sub': {'a': {'$sqrt': 100}}}},
+        ]))
+        self.assertEqual([
+            {'_id': 1, 'pow': 16, 'arr': [1, 2], 'id_plus_one': 2, 'sub': {'a': 10}},
+            {'_id': 2, 'pow': 16, 'arr': [1, 2], 'id_plus_one': 3, 'sub': {'a': 10}},
+        ], actual)
+        self.assertIsNot(actual[0]['arr'], actual[1]['arr'])
+        self.assertIsNot(actual[0]['sub'], actual[1]['sub'])
+
     def test__aggregate_project_first(self):
         self.db.collection.insert_one({'_id': 1, 'arr': [2, 3]})
         actual = self.db.collection.aggregate([
@@ -5321,6 +5436,41 @@ class CollectionAPITest(TestCase):
         ])
         self.assertCountEqual([{'_id': 1}, {'_id': 2}], list(actual))
 
+    def test__aggregate_group_then_project_subset(self):
+        collection = self.db.collection
+        collection.insert_many([{'a': 2, 'b': 3}, {'a': 2, 'b': 5}, {'a': 1, 'b': 1}])
+        actual = collection.aggregate([
+            {'$group': {
+                '_id': '$a',
+                'total': {'$sum': '$b'},
+                'all_b': {'$push': '$b'},
+                'max_b': {'$max': '$b'},
+            }},
+            {'$project': {'_id': False, 'total': True, 'max_b': True}},
+        ])
+        self.assertCountEqual([{'total': 1, 'max_b': 1}, {'total': 8, 'max_b': 5}], list(actual))
+
+        with self.assertRaises(NotImplementedError):
+            collection.aggregate([
+                {'$group': {'_id': '$a', 'dev': {'$stdDevPop': '$b'}}},
+                {'$project': {'_id': True}},
+            ])
+
+    def test__aggregate_group_then_project_invalid_unused_accumulator(self):
+        collection = self.db.collection
+        collection.insert_many([{'a': 2, 'b': 3}, {'a': 1, 'b': 1}])
+        for accumulator, error in (
+                ({'$sum': {'$foo': 1}}, mongomock.OperationFailure),
+                ({'$push': {'$bar': '$b'}}, mongomock.OperationFailure),
+                ({'$bogus': '$b'}, NotImplementedError),
+        ):
+            with self.subTest(accumulator=accumulator):
+                with self.assertRaises(error):
+                    list(collection.aggregate([
+                        {'$group': {'_id': '$a', 'total': {'$sum': '$b'}, 'bad': accumulator}},
+                        {'$project': {'total': True}},
+                    ]))
+
     @skipIf(
         helpers.PYMONGO_VERSION >= version.parse('4.0'),
         'pymongo v4 or above do not specify uuid encoding')
@@ -6117,6 +6267,13 @@ class CollectionAPITest(TestCase):
         }]
         self.assertEqual(expect, list(actual))
 
+    def test__set_equals_invalid_operand_after_mismatch(self):
+        self.db.collection.insert_one({'array': ['one', 'three']})
+        with self.assertRaises(mongomock.OperationFailure):
+            self.db.collection.aggregate([{'$project': {
+                'ne_then_invalid': {'$setEquals': [['one'], '$array', {'$foo': 1}]},
+            }}])
+
     def test__add_to_set_missing_value(self):
         collection = self.db.collection
         collection.insert_many([
@@ -6761,8 +6918,6 @@ class CollectionAPITest(TestCase):
                 collection.aggregate(item)
 
     # https://docs.mongodb.com/manual/reference/operator/aggregation/objectToArray/#examples
-    @skipIf(
-        sys.version_info < (3, 6), "It's harder to keep dict sorted in older versions of Python")
     def test_aggregate_object_to_array_with_example(self):
         collection = self.db.collection
 
@@ -7093,7 +7248,6 @@ class CollectionAPITest(TestCase):
         self.assertNotEqual(
             client.db.collection, mongomock.MongoClient('example.com').db.collection)
 
-    @skipIf(sys.version_info < (3,), 'Older versions of Python do not handle hashing the same way')
     @skipUnless(
         helpers.PYMONGO_VERSION and helpers.PYMONGO_VERSION < version.parse('3.12'),
         "older versions of pymongo didn't have proper hashing")
@@ -7101,7 +7255,6 @@ class CollectionAPITest(TestCase):
         with self.assertRaises(TypeError):
             {self.db.a, self.db.b}  # pylint: disable=pointless-statement
 
-    @skipIf(sys.version_info < (3,), 'Older versions of Python do not handle hashing the same way')
     @skipIf(
         helpers.PYMONGO_VERSION and helpers.PYMONGO_VERSION < version.parse('3.12'),
         "older versions of pymongo didn't have proper hashing")
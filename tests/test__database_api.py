@@ -1,19 +1,35 @@
 import collections
 import datetime
 from packaging import version
-import sys
 from unittest import TestCase, skipIf, skipUnless
 
 import mongomock
 from mongomock import helpers
 from mongomock import read_concern
+from tests.utils import DBRef
 
 try:
     from bson import codec_options
     from pymongo.read_preferences import ReadPreference
+    _DEFAULT_CODEC_OPTIONS = codec_options.CodecOptions()
 except ImportError:
     pass
 
+# Parse the pymongo version gates once for the whole module.
+_PYMONGO_BEFORE_3_8 = helpers.PYMONGO_VERSION < version.parse('3.8')
+_PYMONGO_BEFORE_3_12 = helpers.PYMONGO_VERSION < version.parse('3.12')
+_PYMONGO_BEFORE_4_0 = helpers.PYMONGO_VERSION < version.parse('4.0')
+
+_BAD_COLLECTION_NAMES = (
+    '',
+    'foo..bar',
+    '...',
+    '$foo',
+    '.foo',
+    'bar.',
+    'foo\x00bar',
+)
+
 
 class UTCPlus2(datetime.tzinfo):
     def fromutc(self, dt):
@@ -31,8 +47,23 @@ class UTCPlus2(datetime.tzinfo):
 
 class DatabaseAPITest(TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        super(DatabaseAPITest, cls).setUpClass()
+        cls.client = mongomock.MongoClient()
+
     def setUp(self):
-        self.database = mongomock.MongoClient().somedb
+        super(DatabaseAPITest, self).setUp()
+        self.database = self.client.somedb
+
+    def tearDown(self):
+        super(DatabaseAPITest, self).tearDown()
+        self.client.drop_database('somedb')
+
+    def test__get_database_by_attribute_or_item(self):
+        for database in (self.client.somedb, self.client['somedb']):
+            with self.subTest(database=database):
+                self.assertIs(self.database, database)
 
     def test__get_collection_by_attribute_underscore(self):
         with self.assertRaises(AttributeError) as err_context:
@@ -45,14 +76,17 @@ class DatabaseAPITest(TestCase):
         self.assertEqual(1, self.database['_users'].find_one().get('a'))
 
     def test__session(self):
-        with self.assertRaises(NotImplementedError):
-            self.database.list_collection_names(session=1)
-        with self.assertRaises(NotImplementedError):
-            self.database.drop_collection('a', session=1)
-        with self.assertRaises(NotImplementedError):
-            self.database.create_collection('a', session=1)
-        with self.assertRaises(NotImplementedError):
-            self.database.dereference(_DBRef('somedb', 'a', 'b'), session=1)
+        calls = {
+            'list_collection_names': lambda db: db.list_collection_names(session=1),
+            'drop_collection': lambda db: db.drop_collection('a', session=1),
+            'create_collection': lambda db: db.create_collection('a', session=1),
+            'dereference': lambda db: db.dereference(
+                DBRef('a', 'b', database='somedb'), session=1),
+        }
+        for name, call in calls.items():
+            with self.subTest(name):
+                with self.assertRaises(NotImplementedError):
+                    call(self.database)
 
     def test__command_ping(self):
         self.assertEqual({'ok': 1}, self.database.command({'ping': 1}))
@@ -78,14 +112,14 @@ class DatabaseAPITest(TestCase):
 
     def test__dereference(self):
         self.database.a.insert_one({'_id': 'b', 'val': 42})
-        doc = self.database.dereference(_DBRef('somedb', 'a', 'b'))
+        doc = self.database.dereference(DBRef('a', 'b', database='somedb'))
         self.assertEqual({'_id': 'b', 'val': 42}, doc)
 
-        self.assertEqual(None, self.database.dereference(_DBRef('somedb', 'a', 'a')))
-        self.assertEqual(None, self.database.dereference(_DBRef('somedb', 'b', 'b')))
+        self.assertEqual(None, self.database.dereference(DBRef('a', 'a', database='somedb')))
+        self.assertEqual(None, self.database.dereference(DBRef('b', 'b', database='somedb')))
 
         with self.assertRaises(ValueError):
-            self.database.dereference(_DBRef('otherdb', 'a', 'b'))
+            self.database.dereference(DBRef('a', 'b', database='otherdb'))
 
         with self.assertRaises(TypeError):
             self.database.dereference('b')
@@ -115,7 +149,7 @@ class DatabaseAPITest(TestCase):
 
     @skipIf(not helpers.HAVE_PYMONGO, 'pymongo not installed')
     def test__codec_options(self):
-        self.assertEqual(codec_options.CodecOptions(), self.database.codec_options)
+        self.assertEqual(_DEFAULT_CODEC_OPTIONS, self.database.codec_options)
 
     @skipIf(not helpers.HAVE_PYMONGO, 'pymongo not installed')
     def test__read_concern(self):
@@ -133,7 +167,7 @@ class DatabaseAPITest(TestCase):
         self.database.coll.insert_one({'_id': 42})
         self.assertEqual({'_id': 42}, other.coll.find_one())
 
-        self.database.with_options(codec_options=codec_options.CodecOptions())
+        self.database.with_options(codec_options=_DEFAULT_CODEC_OPTIONS)
         self.database.with_options()
 
         self.database.with_options(codec_options=codec_options.CodecOptions(tz_aware=True))
@@ -161,7 +195,7 @@ class DatabaseAPITest(TestCase):
             self.database.with_options(custom_tzinfo)
 
     @skipIf(
-        not helpers.HAVE_PYMONGO or helpers.PYMONGO_VERSION < version.parse('3.8'),
+        not helpers.HAVE_PYMONGO or _PYMONGO_BEFORE_3_8,
         'pymongo not installed or <3.8')
     def test__with_options_type_registry(self):
         class _CustomTypeCodec(codec_options.TypeCodec):
@@ -188,7 +222,7 @@ class DatabaseAPITest(TestCase):
         self.database.create_collection('a')
         self.database.create_collection('b')
 
-        if helpers.PYMONGO_VERSION >= version.parse('4.0'):
+        if not _PYMONGO_BEFORE_4_0:
             with self.assertRaises(TypeError):
                 self.database.collection_names()
             return
@@ -224,20 +258,12 @@ class DatabaseAPITest(TestCase):
         with self.assertRaises(TypeError):
             self.database[3]  # pylint: disable=pointless-statement
 
-        bad_names = (
-            '',
-            'foo..bar',
-            '...',
-            '$foo',
-            '.foo',
-            'bar.',
-            'foo\x00bar',
-        )
-        for name in bad_names:
-            with self.assertRaises(mongomock.InvalidName, msg=name):
-                self.database.create_collection(name)
-            with self.assertRaises(mongomock.InvalidName, msg=name):
-                self.database[name]  # pylint: disable=pointless-statement
+        for name in _BAD_COLLECTION_NAMES:
+            with self.subTest(name=name):
+                with self.assertRaises(mongomock.InvalidName):
+                    self.database.create_collection(name)
+                with self.assertRaises(mongomock.InvalidName):
+                    self.database[name]  # pylint: disable=pointless-statement
 
     def test__lazy_create_collection(self):
         col = self.database.a
@@ -247,23 +273,20 @@ class DatabaseAPITest(TestCase):
 
     def test__equality(self):
         self.assertEqual(self.database, self.database)
-        client = mongomock.MongoClient('localhost')
-        self.assertNotEqual(client.a, client.b)
-        self.assertEqual(client.a, client.get_database('a'))
-        self.assertEqual(client.a, mongomock.MongoClient('localhost').a)
-        self.assertNotEqual(client.a, mongomock.MongoClient('example.com').a)
+        self.assertNotEqual(self.client.a, self.client.b)
+        self.assertEqual(self.client.a, self.client.get_database('a'))
+        self.assertEqual(self.client.a, mongomock.MongoClient('localhost').a)
+        self.assertNotEqual(self.client.a, mongomock.MongoClient('example.com').a)
 
-    @skipIf(sys.version_info < (3,), 'Older versions of Python do not handle hashing the same way')
     @skipUnless(
-        helpers.PYMONGO_VERSION < version.parse('3.12'),
+        _PYMONGO_BEFORE_3_12,
         "older versions of pymongo didn't have proper hashing")
     def test__not_hashable(self):
         with self.assertRaises(TypeError):
             {self.database}  # pylint: disable=pointless-statement
 
-    @skipIf(sys.version_info < (3,), 'Older versions of Python do not handle hashing the same way')
     @skipIf(
-        helpers.PYMONGO_VERSION < version.parse('3.12'),
+        _PYMONGO_BEFORE_3_12,
         "older versions of pymongo didn't have proper hashing")
     def test__hashable(self):
         {self.database}  # pylint: disable=pointless-statement
@@ -274,6 +297,3 @@ class DatabaseAPITest(TestCase):
             TypeError, msg='read_concern must be an instance of pymongo.read_concern.ReadConcern'
         ):
             mongomock.database.Database(client, 'foo', None, read_concern='bar')
-
-
-_DBRef = collections.namedtuple('DBRef', ['database', 'collection', 'id'])
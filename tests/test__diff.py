@@ -9,11 +9,13 @@ class DiffTest(TestCase):
                 'string',
                 {'complex': {'object': {'with': ['lists']}}},
         ]:
-            self.assertEqual(diff(obj, obj), [])
+            with self.subTest(obj=obj):
+                self.assertEqual(diff(obj, obj), [])
 
     def test__diff_values(self):
-        self._assert_entire_diff(1, 2)
-        self._assert_entire_diff('a', 'b')
+        for a, b in [(1, 2), ('a', 'b')]:
+            with self.subTest(a=a, b=b):
+                self._assert_entire_diff(a, b)
 
     def test__diff_sequences(self):
         self._assert_entire_diff([], [1, 2, 3])
@@ -18,39 +18,48 @@ except ImportError:
 
 try:
     from bson.objectid import ObjectId
-
-    import pymongo
-    from pymongo import MongoClient as PymongoClient
 except ImportError:
     ...
 
+from tests import utils
+
+_NO_LOCAL_MONGO = os.getenv('NO_LOCAL_MONGO')
+_PYMONGO_BEFORE_4_0 = helpers.PYMONGO_VERSION < version.parse('4.0')
+
 
 @skipUnless(helpers.HAVE_PYMONGO, 'pymongo not installed')
 @skipUnless(_HAVE_GRIDFS and hasattr(gridfs.__builtins__, 'copy'), 'gridfs not installed')
-@skipIf(os.getenv('NO_LOCAL_MONGO'), 'No local Mongo server running')
 class GridFsTest(TestCase):
 
     @classmethod
     def setUpClass(cls):
+        super(GridFsTest, cls).setUpClass()
         mongomock.gridfs.enable_gridfs_integration()
+        cls.db_name = 'mongomock___testing_db'
+        cls.fake_conn = mongomock.MongoClient()
+        # Tests that compare with a real server are skipped without one, the
+        # others only need the fake client.
+        cls.mongo_conn = None if _NO_LOCAL_MONGO else utils.connect_to_local_mongodb()
+
+    @classmethod
+    def tearDownClass(cls):
+        super(GridFsTest, cls).tearDownClass()
+        if cls.mongo_conn:
+            cls.mongo_conn.close()
+        cls.fake_conn.close()
 
     def setUp(self):
         super(GridFsTest, self).setUp()
-        self.fake_conn = mongomock.MongoClient()
-        self.mongo_conn = self._connect_to_local_mongodb()
-        self.db_name = 'mongomock___testing_db'
-
-        self.mongo_conn[self.db_name]['fs']['files'].drop()
-        self.mongo_conn[self.db_name]['fs']['chunks'].drop()
+        for conn in (self.mongo_conn, self.fake_conn):
+            if conn:
+                conn[self.db_name]['fs']['files'].delete_many({})
+                conn[self.db_name]['fs']['chunks'].delete_many({})
 
-        self.real_gridfs = gridfs.GridFS(self.mongo_conn[self.db_name])
+        if self.mongo_conn:
+            self.real_gridfs = gridfs.GridFS(self.mongo_conn[self.db_name])
         self.fake_gridfs = gridfs.GridFS(self.fake_conn[self.db_name])
 
-    def tearDown(self):
-        super(GridFsTest, self).setUp()
-        self.mongo_conn.close()
-        self.fake_conn.close()
-
+    @skipIf(_NO_LOCAL_MONGO, 'No local Mongo server running')
     def test__put_get_small(self):
         before = time.time()
         fid = self.fake_gridfs.put(GenFile(50))
@@ -58,11 +67,12 @@ class GridFsTest(TestCase):
         after = time.time()
         ffile = self.fake_gridfs.get(fid)
         rfile = self.real_gridfs.get(rid)
-        self.assertEqual(ffile.read(), rfile.read())
+        self.assertSameContent(rfile, ffile)
         fake_doc = self.get_fake_file(fid)
         mongo_doc = self.get_mongo_file(rid)
         self.assertSameFile(mongo_doc, fake_doc, max_delta_seconds=after - before + 1)
 
+    @skipIf(_NO_LOCAL_MONGO, 'No local Mongo server running')
     def test__put_get_big(self):
         # 500k files are bigger than doc size limit
         before = time.time()
@@ -71,7 +81,7 @@ class GridFsTest(TestCase):
         after = time.time()
         ffile = self.fake_gridfs.get(fid)
         rfile = self.real_gridfs.get(rid)
-        self.assertEqual(ffile.read(), rfile.read())
+        self.assertSameContent(rfile, ffile)
         fake_doc = self.get_fake_file(fid)
         mongo_doc = self.get_mongo_file(rid)
         self.assertSameFile(mongo_doc, fake_doc, max_delta_seconds=after - before + 1)
@@ -128,7 +138,9 @@ class GridFsTest(TestCase):
                 self.fake_gridfs.put(GenFile(62, 5), filename='b'),
                 self.fake_gridfs.put(GenFile(654, 1), filename='b'),
                 self.fake_gridfs.put(GenFile(5), filename='a')]
-        c = self.fake_gridfs.find({'filename': 'a'}).sort('uploadDate', -1)
+        # Files put within the same millisecond share an uploadDate: use the
+        # _id as a tie-breaker as ObjectIds are increasing.
+        c = self.fake_gridfs.find({'filename': 'a'}).sort([('uploadDate', -1), ('_id', -1)])
         should_be_fid3 = c.next()
         should_be_fid0 = c.next()
         self.assertFalse(c.alive)
@@ -137,13 +149,26 @@ class GridFsTest(TestCase):
         self.assertEqual(fids[0], should_be_fid0._id)
 
     def test__put_exists(self):
-        self.fake_gridfs.put(GenFile(1), _id='12345')
-        with self.assertRaises(errors.FileExists):
-            self.fake_gridfs.put(GenFile(2, 3), _id='12345')
+        for file_id in (ObjectId(), '12345'):
+            with self.subTest(file_id=file_id):
+                self.fake_gridfs.put(GenFile(1), _id=file_id)
+                with self.assertRaises(errors.FileExists):
+                    self.fake_gridfs.put(GenFile(2, 3), _id=file_id)
+
+    def assertSameContent(self, real_file, fake_file, chunk_size=65536):
+        # Compare chunk by chunk to avoid holding both files in memory.
+        offset = 0
+        while True:
+            real_chunk = real_file.read(chunk_size)
+            fake_chunk = fake_file.read(chunk_size)
+            self.assertEqual(real_chunk, fake_chunk, msg='content differs after %d' % offset)
+            if not real_chunk:
+                return
+            offset += len(real_chunk)
 
     def assertSameFile(self, real, fake, max_delta_seconds=1):
         # https://pymongo.readthedocs.io/en/stable/migrate-to-pymongo4.html#disable-md5-parameter-is-removed
-        if helpers.PYMONGO_VERSION < version.parse('4.0'):
+        if _PYMONGO_BEFORE_4_0:
             self.assertEqual(real['md5'], fake['md5'])
 
         self.assertEqual(real['length'], fake['length'])
@@ -158,51 +183,20 @@ class GridFsTest(TestCase):
     def get_fake_file(self, i):
         return self.fake_conn[self.db_name]['fs']['files'].find_one({'_id': i})
 
-    def _connect_to_local_mongodb(self, num_retries=60):
-        """Performs retries on connection refused errors (for travis-ci builds)"""
-        for retry in range(num_retries):
-            if retry > 0:
-                time.sleep(0.5)
-            try:
-                return PymongoClient(
-                    host=os.environ.get('TEST_MONGO_HOST', 'localhost'), maxPoolSize=1
-                )
-            except pymongo.errors.ConnectionFailure as e:
-                if retry == num_retries - 1:
-                    raise
-                if 'connection refused' not in e.message.lower():
-                    raise
-
 
 class GenFile(object):
-    def __init__(self, length, value=0, do_encode=True):
-        self.gen = self._gen_data(length, value)
-        self.do_encode = do_encode
-
-    def _gen_data(self, length, value):
-        while length:
-            length -= 1
-            yield value
-
-    def _maybe_encode(self, s):
-        if self.do_encode and isinstance(s, str):
-            return s.encode('UTF-8')
-        return s
+    def __init__(self, length, value=0):
+        self._data = bytes((value,)) * length
+        self._pos = 0
 
     def read(self, num_bytes=-1):
-        s = ''
         if num_bytes <= 0:
-            bytes_left = -1
+            end = len(self._data)
         else:
-            bytes_left = num_bytes
-        while True:
-            n = next(self.gen, None)
-            if n is None:
-                return self._maybe_encode(s)
-            s += chr(n)
-            bytes_left -= 1
-            if bytes_left == 0:
-                return self._maybe_encode(s)
+            end = min(self._pos + num_bytes, len(self._data))
+        chunk = self._data[self._pos:end]
+        self._pos = end
+        return chunk
 
 
 if __name__ == '__main__':
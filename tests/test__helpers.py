@@ -1,5 +1,8 @@
+import collections
 import json
 import os
+import pathlib
+import sys
 
 from mongomock.helpers import hashdict
 from mongomock.helpers import get_value_by_dot, set_value_by_dot
@@ -12,18 +15,16 @@ class HashdictTest(TestCase):
     def test__hashdict(self):
         """Make sure hashdict can be used as a key for a dict"""
         h = {}
-        _id = hashdict({'a': 1})
-        h[_id] = 'foo'
-        self.assertEqual(h[_id], 'foo')
-        _id = hashdict({'a': {'foo': 2}})
-        h[_id] = 'foo'
-        self.assertEqual(h[_id], 'foo')
-        _id = hashdict({'a': {'foo': {'bar': 3}}})
-        h[_id] = 'foo'
-        self.assertEqual(h[_id], 'foo')
-        _id = hashdict({hashdict({'a': '3'}): {'foo': 2}})
-        h[_id] = 'foo'
-        self.assertEqual(h[_id], 'foo')
+        for value in (
+                {'a': 1},
+                {'a': {'foo': 2}},
+                {'a': {'foo': {'bar': 3}}},
+                {hashdict({'a': '3'}): {'foo': 2}},
+        ):
+            with self.subTest(value=value):
+                _id = hashdict(value)
+                h[_id] = 'foo'
+                self.assertEqual(h[_id], 'foo')
 
         with self.assertRaises(TypeError):
             _id['a'] = 2
@@ -43,6 +44,9 @@ class HashdictTest(TestCase):
         self.assertEqual(
             hashdict({'a': 1, 'b': 3, 'c': 4}),
             hashdict({'a': 1, 'b': 2}) + hashdict({'b': 3, 'c': 4}))
+        self.assertEqual(
+            hash(hashdict({'a': 1, 'b': 3, 'c': 4})),
+            hash(hashdict({'a': 1, 'b': 2}) + hashdict({'b': 3, 'c': 4})))
 
         self.assertEqual('hashdict(a=1, b=2)', repr(hashdict({'a': 1, 'b': 2})))
 
@@ -54,63 +58,79 @@ class TestDeprecationWarning(TestCase):
 
 
 class TestAllUriScenarios(TestCase):
-    pass
+    """Uri spec tests generated from the json specifications in `_URI_SPEC_TEST_PATH`.
+
+    This is a simplified version from the PyMongo "test/test_uri_spec.py". It
+    is modified to disregard warnings and only check that valid uri's are valid
+    with the correct database.
+    """
+
+    # Path of the scenario file run by each generated test method.
+    _scenario_paths = {}
+
+    def _run_scenario(self):
+        tests = _load_uri_spec_tests(self._scenario_paths[self._testMethodName])
+        self.assertTrue(tests, 'tests cannot be empty')
+        for test in tests:
+            error = None
+
+            try:
+                dbase = parse_uri(test.uri)['database']
+            except Exception as e:
+                error = e
+
+            if (not error) != test.valid:
+                self.fail("Test failure '%s': %s" % (test.description, error))
+
+            # Compare auth options.
+            if test.has_auth and test.auth_database != dbase:
+                self.fail('Expected %s but got %s' % (test.auth_database, dbase))
 
 
-_URI_SPEC_TEST_PATH = os.path.join(
-    os.path.dirname(os.path.realpath(__file__)),
-    os.path.join('connection_string', 'test'))
+_UriSpecTest = collections.namedtuple(
+    'UriSpecTest', ['description', 'uri', 'valid', 'has_auth', 'auth_database'])
+
+
+def _load_uri_spec_tests(scenario_path):
+    """Load a scenario file, keeping only the fields checked by the tests."""
+    with open(scenario_path, 'rb') as scenario_stream:
+        scenario_def = json.loads(scenario_stream.read())
+    tests = []
+    for test in scenario_def['tests']:
+        auth = test['auth']
+        auth_database = auth and auth['db']  # db == database
+        # Special case for PyMongo's collection parsing
+        if auth_database and '.' in auth_database:
+            auth_database, _ = auth_database.split('.', 1)
+        tests.append(_UriSpecTest(
+            test['description'], test['uri'], test['valid'], auth is not None, auth_database))
+    return tuple(tests)
+
+
+_URI_SPEC_TEST_PATH = os.path.join(os.path.dirname(__file__), 'connection_string', 'test')
+
+
+def _iter_uri_spec_scenarios():
+    """Yield the test name and path of each scenario file, one at a time."""
+    for path in pathlib.Path(_URI_SPEC_TEST_PATH).rglob('*.json'):
+        parent = path.parent
+        test_name = 'test_%s_%s_%s' % (parent.parent.name, parent.name, path.stem)
+        # setattr interns the attribute name anyway, intern it first so that
+        # the _scenario_paths key is the very same string.
+        yield sys.intern(test_name), str(path)
 
 
 def create_uri_spec_tests():
-    """Use json specifications in `_TEST_PATH` to generate uri spec tests.
+    """Add a test method to TestAllUriScenarios for each scenario file.
 
-    This is a simplified version from the PyMongo "test/test_uri_spec.py". It
-    is modified to disregard warnings and only check that valid uri's are valid
-    with the correct database.
+    All methods share the same implementation, the file is only read when the
+    test runs. Calling it again once the tests exist is a no-op.
     """
-    def create_uri_spec_test(scenario_def):
-        def run_scenario(self):
-            self.assertTrue(scenario_def['tests'], 'tests cannot be empty')
-            for test in scenario_def['tests']:
-                dsc = test['description']
-
-                error = False
-
-                try:
-                    dbase = parse_uri(test['uri'])['database']
-                except Exception as e:
-                    print(e)
-                    error = True
-
-                self.assertEqual(not error, test['valid'],
-                                 "Test failure '%s'" % dsc)
-
-                # Compare auth options.
-                auth = test['auth']
-                if auth is not None:
-                    expected_dbase = auth.pop('db')  # db == database
-                    # Special case for PyMongo's collection parsing
-                    if expected_dbase and '.' in expected_dbase:
-                        expected_dbase, _ = expected_dbase.split('.', 1)
-                    self.assertEqual(expected_dbase, dbase,
-                                     'Expected %s but got %s'
-                                     % (expected_dbase, dbase))
-        return run_scenario
-
-    for dirpath, _, filenames in os.walk(_URI_SPEC_TEST_PATH):
-        dirname = os.path.split(dirpath)
-        dirname = os.path.split(dirname[-2])[-1] + '_' + dirname[-1]
-
-        for filename in filenames:
-            with open(os.path.join(dirpath, filename)) as scenario_stream:
-                scenario_def = json.load(scenario_stream)
-            # Construct test from scenario.
-            new_test = create_uri_spec_test(scenario_def)
-            test_name = 'test_%s_%s' % (
-                dirname, os.path.splitext(filename)[0])
-            new_test.__name__ = test_name
-            setattr(TestAllUriScenarios, new_test.__name__, new_test)
+    if TestAllUriScenarios._scenario_paths:
+        return
+    for test_name, scenario_path in _iter_uri_spec_scenarios():
+        TestAllUriScenarios._scenario_paths[test_name] = scenario_path
+        setattr(TestAllUriScenarios, test_name, TestAllUriScenarios._run_scenario)
 
 
 create_uri_spec_tests()
@@ -140,6 +160,12 @@ class ValueByDotTest(TestCase):
             found = get_value_by_dot(doc, key)
             self.assertEqual(found, expected)
 
+    def test__get_value_by_dot_generate_array(self):
+        """Test get_value_by_dot collects values from arrays of documents"""
+        doc = {'a': [{'b': {'c': 1}}, {'b': {'c': 2}}]}
+        for unused_call in range(2):
+            self.assertEqual([1, 2], get_value_by_dot(doc, 'a.b.c', can_generate_array=True))
+
     def test__set_value_by_dot(self):
         """Test set_value_by_dot"""
         for doc, key, expected in (
@@ -0,0 +1,21 @@
+from unittest import TestCase
+
+import mongomock
+from tests.multicollection import MultiCollection
+
+
+class MultiCollectionTest(TestCase):
+
+    def setUp(self):
+        super(MultiCollectionTest, self).setUp()
+        collection = mongomock.MongoClient().db.collection
+        collection.insert_many([{'a': 1}, {'a': 2}])
+        self.cmp = MultiCollection({'fake': collection})
+
+    def test__single_backend_runs_cursor_queries(self):
+        self.cmp.compare.find({'a': 1})
+        self.cmp.compare_ignore_order.find()
+        for compare in (self.cmp.compare, self.cmp.compare_ignore_order):
+            with self.subTest(compare=compare):
+                with self.assertRaises(mongomock.OperationFailure):
+                    compare.find({'a': {'$foo': 1}})
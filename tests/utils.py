@@ -1,3 +1,7 @@
+import os
+import time
+
+
 class DBRef(object):
 
     def __init__(self, collection, id, database=None):
@@ -10,3 +14,32 @@ class DBRef(object):
         if self.database is not None:
             doc['$db'] = self.database
         return doc
+
+
+def connect_to_local_mongodb():
+    """Connects to the MongoDB server used for the comparison tests.
+
+    Connection refused errors are retried with an exponential backoff (50ms up to 800ms), so that
+    a server still starting up (e.g. on CI) gets a chance, during at most TEST_MONGO_WAIT_SECONDS
+    seconds (30 by default). The host can be set with TEST_MONGO_HOST.
+    """
+    import pymongo
+
+    host = os.environ.get('TEST_MONGO_HOST', 'localhost')
+    deadline = time.monotonic() + float(os.environ.get('TEST_MONGO_WAIT_SECONDS', 30))
+    delay = 0.05
+    while True:
+        probe = pymongo.MongoClient(host=host, serverSelectionTimeoutMS=100)
+        try:
+            probe.admin.command('ping')
+        except pymongo.errors.ConnectionFailure as e:
+            if 'connection refused' not in str(e).lower():
+                raise
+            if time.monotonic() + delay > deadline:
+                raise
+            time.sleep(delay)
+            delay = min(delay * 2, 0.8)
+            continue
+        finally:
+            probe.close()
+        return pymongo.MongoClient(host=host, maxPoolSize=1)